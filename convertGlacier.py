@@ -1,11 +1,67 @@
+import asyncio
 import boto3
+import botocore.session
+import csv
+import gzip
+import io
 import time
 import os
+import threading
+import types
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from botocore.config import Config
 from botocore.exceptions import ClientError
 import configparser
+import functools
+import json
+import jmespath
 from enum import Enum
 import logging
+import logging.handlers
+import atexit
+import queue
 from datetime import datetime
+from urllib.parse import quote, unquote_plus
+
+# Concurrency settings for the S3 API fan-out
+MAX_WORKERS = 64
+RESTORE_WORKERS = 32
+LIST_WORKERS = 16
+MAX_POOL_CONNECTIONS = 128
+
+# Listing is split into shards by common prefix, descending up to
+# MAX_SHARD_DEPTH levels; levels too large to enumerate in one page are split
+# into key ranges on the next character instead
+MAX_SHARD_DEPTH = 3
+SHARD_KEY_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+# Listed pages buffered between the shard workers and the consumer; when it
+# is full the workers wait, so listing cannot run ahead of processing
+LIST_PAGE_QUEUE_SIZE = 2 * LIST_WORKERS
+
+# Maximum in-flight requests when aws.use_asyncio is enabled
+ASYNC_CONCURRENCY = 256
+
+# Discovered objects buffered between the listing producer and each consumer
+PIPELINE_QUEUE_SIZE = 10000
+
+# Seconds between S3 Batch Operations job status checks
+BATCH_JOB_POLL_INTERVAL = 60
+
+# Request rates kept just under the S3 per-prefix limits
+WRITE_REQUESTS_PER_SECOND = 3400  # PUT/COPY/POST/DELETE
+READ_REQUESTS_PER_SECOND = 5400   # GET/HEAD
+
+# Restore status polling backs off between these intervals (seconds)
+MIN_CHECK_INTERVAL = 300
+MAX_CHECK_INTERVAL = 3600
+
+# Log discovery progress every this many objects
+PROGRESS_LOG_INTERVAL = 10000
+
+# Inventory manifests older than this fall back to live listing
+INVENTORY_MAX_AGE_HOURS = 48
 
 class StorageClass(Enum):
     GLACIER = "GLACIER"
@@ -22,6 +78,146 @@ class ConversionStats:
         self.converted = 0
         self.failed = 0
         self.skipped = 0
+        # Worker threads update the counters concurrently
+        self.lock = threading.Lock()
+
+class TokenBucket:
+    """Thread-safe token bucket limiting how many requests are sent per second"""
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """Take tokens if available, otherwise return the seconds to wait before retrying"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0
+            return (tokens - self.tokens) / self.rate
+
+    def acquire(self, tokens=1):
+        """Block until the requested number of tokens is available"""
+        while True:
+            wait = self.reserve(tokens)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens=1):
+        """Wait without blocking the event loop until the tokens are available"""
+        while True:
+            wait = self.reserve(tokens)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+write_rate_limiter = TokenBucket(WRITE_REQUESTS_PER_SECOND)
+read_rate_limiter = TokenBucket(READ_REQUESTS_PER_SECOND)
+
+class AsyncS3Runner:
+    """Event loop on a dedicated thread sharing one aioboto3 S3 client
+
+    Coroutines are submitted from any thread and return concurrent futures,
+    so the client, its connection pool and TLS sessions live for the whole
+    run instead of being rebuilt on every call.
+    """
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        try:
+            self.semaphore = self.run(self.create_semaphore())
+            self.client_context = get_async_s3_client()
+            self.client = self.run(self.client_context.__aenter__())
+        except Exception:
+            # Don't leave the loop thread running behind a failed start
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
+            raise
+
+    async def create_semaphore(self):
+        # Created on the loop it guards
+        return asyncio.Semaphore(ASYNC_CONCURRENCY)
+
+    def submit(self, coroutine):
+        """Schedule a coroutine on the loop and return a concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self, coroutine):
+        """Run a coroutine on the loop and wait for its result"""
+        return self.submit(coroutine).result()
+
+    def close(self):
+        self.run(self.client_context.__aexit__(None, None, None))
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+class WorkerStage:
+    """Long-lived worker pool that runs one S3 operation per submitted object
+
+    Objects run on a thread pool, or on the shared event loop when
+    aws.use_asyncio is enabled. At most max_in_flight objects are queued or
+    running at once; submit() blocks beyond that, which pushes back on
+    whatever is feeding the stage.
+    """
+    def __init__(self, max_workers):
+        use_asyncio = load_config()['use_asyncio']
+        # Start the runner up front so a broken async setup fails the run once
+        # rather than once per object
+        self.runner = get_async_runner() if use_asyncio else None
+        self.executor = None if use_asyncio else ThreadPoolExecutor(max_workers=max_workers)
+        self.max_in_flight = 2 * (ASYNC_CONCURRENCY if use_asyncio else max_workers)
+        self.slots = threading.BoundedSemaphore(self.max_in_flight)
+
+    def submit(self, operation, async_operation, *args, on_done=None):
+        """Run operation(*args), or async_operation(*args) on the event loop, and return its future
+
+        on_done, if given, is called with the finished future before its slot
+        is released, so join() also waits for it.
+        """
+        self.slots.acquire()
+        try:
+            if self.runner:
+                future = self.runner.submit(async_operation(*args))
+            else:
+                future = self.executor.submit(operation, *args)
+        except Exception:
+            self.slots.release()
+            raise
+
+        def finished(future):
+            try:
+                if on_done:
+                    on_done(future)
+            finally:
+                self.slots.release()
+
+        future.add_done_callback(finished)
+        return future
+
+    def join(self):
+        """Wait until every submitted object has finished"""
+        for _ in range(self.max_in_flight):
+            self.slots.acquire()
+        for _ in range(self.max_in_flight):
+            self.slots.release()
+
+    def shutdown(self):
+        self.join()
+        if self.executor:
+            self.executor.shutdown()
+
+def call_with_rate_limit(rate_limiter, operation, **kwargs):
+    """Wait for the rate limiter, then call the S3 operation"""
+    rate_limiter.acquire()
+    return operation(**kwargs)
 
 def setup_logging():
     """Setup logging configuration"""
@@ -33,98 +229,613 @@ def setup_logging():
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     log_file = f'logs/conversion_{timestamp}.log'
 
+    # Write log records from a background thread so the S3 workers never
+    # block on file or console I/O
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler(log_file)
+    stream_handler = logging.StreamHandler()
+    file_handler.setFormatter(formatter)
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.Queue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    # The listener's handlers do the real formatting
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
     # Configure logging
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
+        handlers=[queue_handler]
     )
     return logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=1)
 def load_config():
+    """Read config/s3.properties once and return a read-only mapping"""
     config_file='config/s3.properties'
     config = configparser.ConfigParser()
     config.read(config_file)
     
-    return {
+    return types.MappingProxyType({
         'access_key': config.get('DEFAULT', 'aws.access_key'),
         'secret_key': config.get('DEFAULT', 'aws.secret_key'),
         'region': config.get('DEFAULT', 'aws.region'),
         'bucket_name': config.get('DEFAULT', 'aws.bucket_name'),
         'prefix_path': config.get('DEFAULT', 'aws.prefix_path'),
-        'storageclass': config.get('DEFAULT', 'aws.storageclass')
-    }
+        'storageclass': config.get('DEFAULT', 'aws.storageclass'),
+        'restore_queue_url': config.get('DEFAULT', 'aws.restore_queue_url', fallback=''),
+        'use_asyncio': config.getboolean('DEFAULT', 'aws.use_asyncio', fallback=False),
+        'use_inventory': config.getboolean('DEFAULT', 'aws.use_inventory', fallback=False),
+        'inventory_manifest_uri': config.get('DEFAULT', 'aws.inventory_manifest_uri', fallback=''),
+        'use_batch_operations': config.getboolean('DEFAULT', 'aws.use_batch_operations', fallback=False),
+        'account_id': config.get('DEFAULT', 'aws.account_id', fallback=''),
+        'batch_role_arn': config.get('DEFAULT', 'aws.batch_role_arn', fallback=''),
+        'batch_manifest_bucket': (config.get('DEFAULT', 'aws.batch_manifest_bucket', fallback='')
+                                  or config.get('DEFAULT', 'aws.bucket_name'))
+    })
 
+@functools.lru_cache(maxsize=1)
 def get_s3_client():
-    """Initialize and return S3 client with credentials"""
+    """Initialize and return the shared S3 client (created once and reused)"""
     try:
         config=load_config()
-        s3_client = boto3.client(
-            's3',
+
+        # Leave response timestamps as strings: nothing here reads them, and
+        # parsing the LastModified of every listed object into a datetime is
+        # a large share of the CPU spent deserializing LIST pages
+        botocore_session = botocore.session.get_session()
+        botocore_session.get_component('response_parser_factory').set_parser_defaults(
+            timestamp_parser=lambda value: value
+        )
+        session = boto3.session.Session(
+            botocore_session=botocore_session,
             aws_access_key_id=config['access_key'],
             aws_secret_access_key=config['secret_key'],
             region_name=config['region']
         )
+        s3_client = session.client(
+            's3',
+            config=Config(
+                max_pool_connections=MAX_POOL_CONNECTIONS,
+                retries={'max_attempts': 10, 'mode': 'adaptive'},
+                tcp_keepalive=True
+            )
+        )
         return s3_client
     except Exception as e:
         raise Exception(f"Failed to initialize S3 client: {str(e)}")
 
-def process_glacier_objects(logger, bucket_name, storage_configs, prefix=''):
-    """Process objects based on their storage class"""
+def get_async_s3_client():
+    """Return an aioboto3 S3 client context manager using the configured credentials"""
+    try:
+        import aioboto3
+    except ImportError:
+        raise Exception("aioboto3 is required when aws.use_asyncio is enabled")
+
+    config = load_config()
+    session = aioboto3.Session(
+        aws_access_key_id=config['access_key'],
+        aws_secret_access_key=config['secret_key'],
+        region_name=config['region']
+    )
+    return session.client(
+        's3',
+        config=Config(
+            max_pool_connections=ASYNC_CONCURRENCY,
+            retries={'max_attempts': 10, 'mode': 'adaptive'},
+            tcp_keepalive=True
+        )
+    )
+
+async_runner_lock = threading.Lock()
+# Set when the runner fails to start so later callers fail fast instead of
+# starting another one
+async_runner_error = None
+
+@functools.lru_cache(maxsize=1)
+def create_async_runner():
+    runner = AsyncS3Runner()
+    atexit.register(runner.close)
+    return runner
+
+def get_async_runner():
+    """Start and return the shared asyncio runner (created once and reused)"""
+    # Pipeline threads may ask for the runner at the same time
+    global async_runner_error
+    with async_runner_lock:
+        if async_runner_error is not None:
+            raise Exception(f"Async S3 runner failed to start: {str(async_runner_error)}")
+        try:
+            return create_async_runner()
+        except Exception as e:
+            async_runner_error = e
+            raise
+
+@functools.lru_cache(maxsize=1)
+def get_sqs_client():
+    """Initialize and return the shared SQS client used for restore events"""
+    try:
+        config=load_config()
+        sqs_client = boto3.client(
+            'sqs',
+            aws_access_key_id=config['access_key'],
+            aws_secret_access_key=config['secret_key'],
+            region_name=config['region']
+        )
+        return sqs_client
+    except Exception as e:
+        raise Exception(f"Failed to initialize SQS client: {str(e)}")
+
+@functools.lru_cache(maxsize=1)
+def get_s3control_client():
+    """Initialize and return the shared S3 Control client used for Batch Operations"""
+    try:
+        config=load_config()
+        s3control_client = boto3.client(
+            's3control',
+            aws_access_key_id=config['access_key'],
+            aws_secret_access_key=config['secret_key'],
+            region_name=config['region']
+        )
+        return s3control_client
+    except Exception as e:
+        raise Exception(f"Failed to initialize S3 Control client: {str(e)}")
+
+def list_matching_objects(bucket_name, shard, expression):
+    """Yield the objects in a shard that match the storage class filter, one list per page
+
+    A shard is (prefix, start_after, last_key): the keys under prefix that
+    sort after start_after and up to and including last_key. None leaves
+    that end of the range open.
+    """
+    shard_prefix, start_after, last_key = shard
+    paginator = get_s3_client().get_paginator('list_objects_v2')
+    params = {'Bucket': bucket_name, 'Prefix': shard_prefix, 'PaginationConfig': {'PageSize': 1000}}
+    if start_after is not None:
+        params['StartAfter'] = start_after
+
+    for page in paginator.paginate(**params):
+        contents = page.get('Contents', [])
+        end_of_shard = last_key is not None and contents and contents[-1]['Key'] > last_key
+        if end_of_shard:
+            contents = [obj for obj in contents if obj['Key'] <= last_key]
+        yield expression.search({'Contents': contents}) or []
+        if end_of_shard:
+            break
+
+def probe_prefix(bucket_name, prefix, expression):
+    """List the first page of a prefix with Delimiter='/'
+
+    Returns the matching objects directly under the prefix, the common
+    prefixes below it, and whether the level has more than one page.
+    """
+    page = get_s3_client().list_objects_v2(
+        Bucket=bucket_name,
+        Prefix=prefix,
+        Delimiter='/',
+        MaxKeys=1000
+    )
+    common_prefixes = [p['Prefix'] for p in page.get('CommonPrefixes', [])]
+    return expression.search(page) or [], common_prefixes, page.get('IsTruncated', False)
+
+def character_range_shards(prefix):
+    """Split a prefix into key ranges on the character after the prefix
+
+    The first and last ranges are open-ended, so keys starting with
+    characters outside SHARD_KEY_ALPHABET (including non-ASCII) are covered.
+    """
+    boundaries = [None] + [prefix + c for c in SHARD_KEY_ALPHABET] + [None]
+    return [(prefix, boundaries[i], boundaries[i + 1]) for i in range(len(boundaries) - 1)]
+
+def discover_shards(bucket_name, prefix, expression):
+    """Split the listing under a prefix into shards that can be listed concurrently
+
+    Returns the matching objects found while probing and the shards that
+    still have to be listed.
+    """
+    found_objects = []
+    shards = []
+    frontier = [prefix]
+    with ThreadPoolExecutor(max_workers=LIST_WORKERS) as executor:
+        for _ in range(MAX_SHARD_DEPTH):
+            next_frontier = []
+            probes = executor.map(lambda level_prefix: probe_prefix(bucket_name, level_prefix, expression),
+                                  frontier)
+            for level_prefix, (matches, common_prefixes, truncated) in zip(frontier, probes):
+                if truncated:
+                    # Too many entries to enumerate this level, so split it by key range
+                    shards.extend(character_range_shards(level_prefix))
+                else:
+                    found_objects.extend(matches)
+                    next_frontier.extend(common_prefixes)
+            frontier = next_frontier
+            if len(shards) + len(frontier) >= LIST_WORKERS:
+                break
+
+    # Prefixes left unexpanded are listed whole
+    shards.extend((level_prefix, None, None) for level_prefix in frontier)
+    return found_objects, shards
+
+def read_inventory_file(s3_client, bucket, key, file_format, file_schema, storage_class_values):
+    """Read one inventory data file and return its (key, storage class) rows
+
+    Versioned inventories also list noncurrent versions and delete markers;
+    only the current version of each key is returned.
+    """
+    body = s3_client.get_object(Bucket=bucket, Key=key)['Body'].read()
+
+    if file_format == 'CSV':
+        columns = [column.strip() for column in file_schema.split(',')]
+        key_index = columns.index('Key')
+        storage_class_index = columns.index('StorageClass')
+        is_latest_index = columns.index('IsLatest') if 'IsLatest' in columns else None
+        is_delete_marker_index = columns.index('IsDeleteMarker') if 'IsDeleteMarker' in columns else None
+        rows = []
+        for row in csv.reader(io.StringIO(gzip.decompress(body).decode('utf-8'))):
+            storage_class = row[storage_class_index]
+            if storage_class not in storage_class_values:
+                continue
+            if is_latest_index is not None and row[is_latest_index] != 'true':
+                continue
+            if is_delete_marker_index is not None and row[is_delete_marker_index] == 'true':
+                continue
+            # CSV inventory keys are URL-encoded
+            rows.append((unquote_plus(row[key_index]), storage_class))
+        return rows
+
+    # Parquet and ORC inventories need pyarrow
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        raise Exception(f"pyarrow is required to read {file_format} inventory files")
+
+    version_columns = [column for column in ('is_latest', 'is_delete_marker') if column in file_schema]
+    columns = ['key', 'storage_class'] + version_columns
+    if file_format == 'Parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(
+            io.BytesIO(body),
+            columns=columns,
+            filters=[('storage_class', 'in', sorted(storage_class_values))]
+        )
+    elif file_format == 'ORC':
+        import pyarrow.orc as orc
+        table = orc.read_table(io.BytesIO(body), columns=columns)
+    else:
+        raise Exception(f"Unsupported inventory format: {file_format}")
+
+    mask = pc.is_in(table['storage_class'], value_set=pa.array(sorted(storage_class_values)))
+    if 'is_latest' in version_columns:
+        mask = pc.and_(mask, pc.fill_null(table['is_latest'], True))
+    if 'is_delete_marker' in version_columns:
+        mask = pc.and_(mask, pc.invert(pc.fill_null(table['is_delete_marker'], False)))
+    table = table.filter(mask)
+
+    return list(zip(table['key'].to_pylist(), table['storage_class'].to_pylist()))
+
+def list_inventory_objects(logger, manifest_uri, bucket_name, prefix, storage_class_values):
+    """List matching objects from an S3 Inventory manifest
+
+    Returns an iterator of object batches, one per inventory file, or None
+    when the manifest is stale or describes another bucket so the caller can
+    fall back to live listing.
+    """
     s3_client = get_s3_client()
-    paginator = s3_client.get_paginator('list_objects_v2')
-   
-    # Initialize statistics for each storage class
-    stats = {config.storage_class: ConversionStats() for config in storage_configs}
-    objects_to_process = {config.storage_class: [] for config in storage_configs}
+    manifest_bucket, _, manifest_key = manifest_uri[len('s3://'):].partition('/')
+    manifest = json.loads(
+        s3_client.get_object(Bucket=manifest_bucket, Key=manifest_key)['Body'].read()
+    )
+
+    if manifest.get('sourceBucket') != bucket_name:
+        logger.error(f"Inventory manifest {manifest_uri} is for bucket {manifest.get('sourceBucket')}, "
+                     f"not {bucket_name}; falling back to live listing")
+        return None
+
+    created = datetime.fromtimestamp(int(manifest['creationTimestamp']) / 1000)
+    age_hours = (datetime.now() - created).total_seconds() / 3600
+    if age_hours > INVENTORY_MAX_AGE_HOURS:
+        logger.info(f"Inventory manifest is {age_hours:.0f} hours old, falling back to live listing")
+        return None
+
+    # destinationBucket is an ARN: arn:aws:s3:::bucket
+    inventory_bucket = manifest['destinationBucket'].split(':::')[-1]
+    file_format = manifest['fileFormat']
+    logger.info(f"Reading {len(manifest['files'])} {file_format} inventory files from {manifest_uri}")
+
+    # Read the data files lazily, one batch of matching objects per file
+    return (
+        [
+            {'Key': key, 'StorageClass': storage_class}
+            for key, storage_class in read_inventory_file(
+                s3_client, inventory_bucket, inventory_file['key'], file_format,
+                manifest.get('fileSchema', ''), storage_class_values)
+            if key.startswith(prefix)
+        ]
+        for inventory_file in manifest['files']
+    )
+
+def list_objects_by_shard(logger, bucket_name, prefix, expression):
+    """Yield batches of matching objects, one per listed page
+
+    Objects found while discovering the shards are yielded first. The shards
+    are then listed concurrently; workers hand each page over through a
+    bounded queue, so at most LIST_PAGE_QUEUE_SIZE pages are held at a time.
+    """
+    found_objects, shards = discover_shards(bucket_name, prefix, expression)
+    logger.info(f"Listing {len(shards)} shards under '{prefix}'")
+    yield found_objects
+
+    page_queue = queue.Queue(maxsize=LIST_PAGE_QUEUE_SIZE)
+    stop = threading.Event()
+
+    def put(item):
+        # Give up once the consumer has stopped so workers never block forever
+        while not stop.is_set():
+            try:
+                page_queue.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def list_shard(shard):
+        try:
+            for matches in list_matching_objects(bucket_name, shard, expression):
+                if stop.is_set() or (matches and not put(matches)):
+                    return
+        except Exception as e:
+            put(e)
+        finally:
+            # None marks the end of this shard
+            put(None)
+
+    with ThreadPoolExecutor(max_workers=LIST_WORKERS) as executor:
+        for shard in shards:
+            executor.submit(list_shard, shard)
+
+        try:
+            remaining = len(shards)
+            while remaining:
+                item = page_queue.get()
+                if item is None:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            stop.set()
+
+def process_glacier_objects(logger, bucket_name, storage_configs, stats, prefix='', inventory_manifest_uri=''):
+    """Yield (storage class, object) pairs for objects in the configured storage classes
+
+    Objects are yielded as each listing shard or inventory file is read, so
+    restore and conversion can start before discovery has finished.
+    """
+    # Index configs and stats by the storage class string S3 returns
+    config_by_storage_class = {config.storage_class.value: config for config in storage_configs}
+    stats_by_storage_class = {config.storage_class.value: stats[config.storage_class]
+                              for config in storage_configs}
+    storage_class_values = frozenset(config_by_storage_class)
     logger.info("...........gprocess1..."+bucket_name+"..."+prefix) 
+
+    # Filter each page down to the storage classes we handle
+    storage_class_filter = " || ".join(
+        f"StorageClass=='{value}'" for value in sorted(storage_class_values)
+    )
+    expression = jmespath.compile(
+        f"Contents[?{storage_class_filter}].{{Key:Key,StorageClass:StorageClass}}"
+    )
+    found_count = 0
+    log_each_object = logger.isEnabledFor(logging.DEBUG)
     try:
-        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
-          
-            logger.info(".....33..")
-            if 'Contents' not in page:
-                continue
-                
-            for obj in page['Contents']:
-              
-                if 'StorageClass' not in obj:
+        object_batches = None
+        if inventory_manifest_uri:
+            object_batches = list_inventory_objects(logger, inventory_manifest_uri, bucket_name,
+                                                    prefix, storage_class_values)
+        if object_batches is None:
+            object_batches = list_objects_by_shard(logger, bucket_name, prefix, expression)
+
+        for found_objects in object_batches:
+            for obj in found_objects:
+                storage_class_value = obj['StorageClass']
+                config = config_by_storage_class.get(storage_class_value)
+                if config is None:
                     continue
-                
-                storage_class = obj['StorageClass']
                 key = obj['Key']
-              
-                for config in storage_configs:
-                    if storage_class == config.storage_class.value:
-                        stats[config.storage_class].found += 1
-                        objects_to_process[config.storage_class].append({
-                            'key': key,
-                            'convert_to_intelligent': config.convert_to_intelligent
-                        })
-                        logger.info(f"Found {config.storage_class.value} object: {key}")
-                        break
-        
+                stats_by_storage_class[storage_class_value].found += 1
+                found_count += 1
+                if log_each_object:
+                    logger.debug("Found %s object: %s", storage_class_value, key)
+                if found_count % PROGRESS_LOG_INTERVAL == 0:
+                    logger.info(f"Discovered {found_count} objects so far")
+                yield config.storage_class, {
+                    'key': key,
+                    'convert_to_intelligent': config.convert_to_intelligent
+                }
+
         # Log summary of found objects
         for storage_class, stat in stats.items():
             logger.info(f"Found {stat.found} objects in {storage_class.value}")
-        
-        return objects_to_process, stats
-                        
+
     except Exception as e:
         logger.error(f"Error listing objects: {str(e)}")
-        return {}, stats
 
-def initiate_restore_for_glacier_objects(logger, bucket_name, objects):
-    """Initiate restore requests for Glacier objects"""
+def initiate_restore(logger, bucket_name, obj):
+    """Initiate a Bulk restore for one Glacier object
+
+    Returns the object when its restore is under way, or None if it failed.
+    """
+    key = obj['key']
+    try:
+        write_rate_limiter.acquire()
+        get_s3_client().restore_object(
+            Bucket=bucket_name,
+            Key=key,
+            RestoreRequest={
+                'Days': 10,
+                'GlacierJobParameters': {
+                    'Tier': 'Bulk'
+                }
+            }
+        )
+        logger.info(f"Initiated restore for: {key}")
+        return obj
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'RestoreAlreadyInProgress':
+            logger.info(f"Restore already in progress for: {key}")
+            return obj
+        logger.error(f"Error initiating restore for {key}: {str(e)}")
+        return None
+    except Exception as e:
+        logger.error(f"Error initiating restore for {key}: {str(e)}")
+        return None
+
+def check_restore_status(logger, bucket_name, objects, on_restored=None):
+    """Check restore status for objects
+
+    on_restored, if given, is called with each restored object as soon as
+    its status comes back.
+    """
+    if load_config()['use_asyncio']:
+        return get_async_runner().run(check_restore_status_async(logger, bucket_name, objects, on_restored))
+
     s3_client = get_s3_client()
-    objects_to_restore = []
-    
-    for obj in objects:
-        key = obj['key']
+    restored_objects = []
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(call_with_rate_limit, read_rate_limiter, s3_client.head_object,
+                            Bucket=bucket_name, Key=obj['key']): obj
+            for obj in objects
+        }
+
+        for future in as_completed(futures):
+            obj = futures[future]
+            key = obj['key']
+            try:
+                response = future.result()
+                if 'ongoing-request="false"' in response.get('Restore', ''):
+                    restored_objects.append(obj)
+                    logger.info(f"Restore completed for: {key}")
+                    if on_restored:
+                        on_restored(obj)
+            except Exception as e:
+                logger.error(f"Error checking restore status for {key}: {str(e)}")
+
+    return restored_objects
+
+def restore_event_keys(logger, body, bucket_name):
+    """Return the keys of completed restores in an SQS message body
+
+    Accepts S3 event notifications sent to the queue directly or wrapped in
+    an SNS envelope. Malformed records are logged and skipped.
+    """
+    try:
+        event = json.loads(body)
+        # SNS delivers the S3 notification as a JSON string in Message
+        if 'Records' not in event and 'Message' in event:
+            event = json.loads(event['Message'])
+    except (ValueError, TypeError) as e:
+        logger.error(f"Skipping malformed restore event: {str(e)}")
+        return []
+
+    if not isinstance(event, dict) or not isinstance(event.get('Records'), list):
+        if not isinstance(event, dict) or event.get('Event') != 's3:TestEvent':
+            logger.warning(f"Skipping restore queue message without Records: {body[:200]}")
+        return []
+
+    keys = []
+    for record in event['Records']:
+        try:
+            if not record.get('eventName', '').startswith('ObjectRestore:Completed'):
+                continue
+            if record['s3']['bucket']['name'] != bucket_name:
+                continue
+            keys.append(unquote_plus(record['s3']['object']['key']))
+        except (KeyError, TypeError, AttributeError) as e:
+            logger.error(f"Skipping malformed restore event record: {str(e)}")
+    return keys
+
+def receive_restore_events(logger, queue_url, bucket_name, pending):
+    """Long-poll SQS for s3:ObjectRestore:Completed events
+
+    Returns the objects in pending whose restore has completed. Every
+    received message is deleted, including test events and events for
+    keys that are not pending.
+    """
+    sqs_client = get_sqs_client()
+    restored_objects = {}
+
+    response = sqs_client.receive_message(
+        QueueUrl=queue_url,
+        WaitTimeSeconds=20,
+        MaxNumberOfMessages=10
+    )
+    messages = response.get('Messages', [])
+    for message in messages:
+        for key in restore_event_keys(logger, message['Body'], bucket_name):
+            if key in pending and key not in restored_objects:
+                restored_objects[key] = pending[key]
+                logger.info(f"Restore completed for: {key}")
+
+    if messages:
+        sqs_client.delete_message_batch(
+            QueueUrl=queue_url,
+            Entries=[
+                {'Id': str(i), 'ReceiptHandle': message['ReceiptHandle']}
+                for i, message in enumerate(messages)
+            ]
+        )
+
+    return list(restored_objects.values())
+
+def convert_object(logger, bucket_name, obj, stats):
+    """Copy one object onto itself as Intelligent-Tiering and record the outcome"""
+    key = obj['key']
+    # An in-place copy is required for both Glacier and Glacier IR: lifecycle
+    # rules only transition objects down the storage class waterfall, so a
+    # tag-filtered rule cannot move Glacier IR objects to Intelligent-Tiering
+    try:
+        write_rate_limiter.acquire()
+        get_s3_client().copy_object(
+            Bucket=bucket_name,
+            Key=key,
+            CopySource={'Bucket': bucket_name, 'Key': key},
+            StorageClass='INTELLIGENT_TIERING',
+            MetadataDirective='COPY'
+        )
+    except Exception as e:
+        with stats.lock:
+            stats.failed += 1
+        logger.error(f"Error converting {key}: {str(e)}")
+        return
+    with stats.lock:
+        stats.converted += 1
+    logger.info(f"Converted to Intelligent-Tiering: {key}")
+
+def submit_conversion(logger, stage, bucket_name, obj, stats):
+    """Queue one object for conversion on a stage, or count it as skipped"""
+    if not obj['convert_to_intelligent']:
+        with stats.lock:
+            stats.skipped += 1
+        logger.info(f"Skipping conversion for: {obj['key']}")
+        return
+    stage.submit(convert_object, convert_object_async, logger, bucket_name, obj, stats)
+
+async def initiate_restore_async(logger, bucket_name, obj):
+    """Initiate a Bulk restore for one Glacier object on the shared event loop"""
+    runner = get_async_runner()
+    key = obj['key']
+    async with runner.semaphore:
+        await write_rate_limiter.acquire_async()
         try:
-            s3_client.restore_object(
+            await runner.client.restore_object(
                 Bucket=bucket_name,
                 Key=key,
                 RestoreRequest={
@@ -134,59 +845,189 @@ def initiate_restore_for_glacier_objects(logger, bucket_name, objects):
                     }
                 }
             )
-            objects_to_restore.append(obj)
             logger.info(f"Initiated restore for: {key}")
+            return obj
         except ClientError as e:
             if e.response['Error']['Code'] == 'RestoreAlreadyInProgress':
                 logger.info(f"Restore already in progress for: {key}")
-                objects_to_restore.append(obj)
-            else:
-                logger.error(f"Error initiating restore for {key}: {str(e)}")
-                
-    return objects_to_restore
-
-def check_restore_status(logger, bucket_name, objects):
-    """Check restore status for objects"""
-    s3_client = get_s3_client()
-    restored_objects = []
-    
-    for obj in objects:
-        key = obj['key']
-        try:
-            response = s3_client.head_object(Bucket=bucket_name, Key=key)
-            if 'Restore' in response and 'ongoing-request="false"' in response['Restore']:
-                restored_objects.append(obj)
-                logger.info(f"Restore completed for: {key}")
+                return obj
+            logger.error(f"Error initiating restore for {key}: {str(e)}")
+            return None
         except Exception as e:
-            logger.error(f"Error checking restore status for {key}: {str(e)}")
-            
-    return restored_objects
+            logger.error(f"Error initiating restore for {key}: {str(e)}")
+            return None
 
-def convert_to_intelligent_tiering(logger, bucket_name, objects, stats):
-    """Convert objects to Intelligent-Tiering"""
-    s3_client = get_s3_client()
-    
-    for obj in objects:
-        if not obj['convert_to_intelligent']:
-            stats.skipped += 1
-            logger.info(f"Skipping conversion for: {obj['key']}")
-            continue
-            
+async def check_restore_status_async(logger, bucket_name, objects, on_restored=None):
+    """Check restore status for objects on the shared event loop"""
+    runner = get_async_runner()
+
+    async def check(obj):
         key = obj['key']
+        async with runner.semaphore:
+            await read_rate_limiter.acquire_async()
+            try:
+                response = await runner.client.head_object(Bucket=bucket_name, Key=key)
+            except Exception as e:
+                logger.error(f"Error checking restore status for {key}: {str(e)}")
+                return None
+        if 'ongoing-request="false"' in response.get('Restore', ''):
+            logger.info(f"Restore completed for: {key}")
+            if on_restored:
+                # Off the loop thread: on_restored may block on a stage that
+                # runs on this same loop
+                await asyncio.to_thread(on_restored, obj)
+            return obj
+        return None
+
+    results = await asyncio.gather(*(check(obj) for obj in objects))
+    return [obj for obj in results if obj is not None]
+
+async def convert_object_async(logger, bucket_name, obj, stats):
+    """Copy one object onto itself as Intelligent-Tiering on the shared event loop"""
+    runner = get_async_runner()
+    key = obj['key']
+    async with runner.semaphore:
+        await write_rate_limiter.acquire_async()
         try:
-            s3_client.copy_object(
+            await runner.client.copy_object(
                 Bucket=bucket_name,
                 Key=key,
                 CopySource={'Bucket': bucket_name, 'Key': key},
                 StorageClass='INTELLIGENT_TIERING',
                 MetadataDirective='COPY'
             )
-            stats.converted += 1
-            logger.info(f"Converted to Intelligent-Tiering: {key}")
         except Exception as e:
-            stats.failed += 1
+            with stats.lock:
+                stats.failed += 1
             logger.error(f"Error converting {key}: {str(e)}")
+            return
+    with stats.lock:
+        stats.converted += 1
+    logger.info(f"Converted to Intelligent-Tiering: {key}")
+
+def write_batch_manifest(bucket_name, manifest_bucket, manifest_key, objects):
+    """Upload a Batch Operations CSV manifest and return its location"""
+    # Keys must be URL-encoded in the manifest
+    body = "".join(f"{bucket_name},{quote(obj['key'])}\n" for obj in objects)
+    response = get_s3_client().put_object(
+        Bucket=manifest_bucket,
+        Key=manifest_key,
+        Body=body.encode('utf-8')
+    )
+    return {
+        'ObjectArn': f"arn:aws:s3:::{manifest_bucket}/{manifest_key}",
+        'ETag': response['ETag'].strip('"')
+    }
+
+def run_batch_job(logger, config, operation, manifest_location, report_prefix, description):
+    """Create an S3 Batch Operations job and wait for it to finish"""
+    s3control_client = get_s3control_client()
+    response = s3control_client.create_job(
+        AccountId=config['account_id'],
+        ConfirmationRequired=False,
+        Operation=operation,
+        Manifest={
+            'Spec': {'Format': 'S3BatchOperations_CSV_20180820', 'Fields': ['Bucket', 'Key']},
+            'Location': manifest_location
+        },
+        Report={
+            'Bucket': f"arn:aws:s3:::{config['batch_manifest_bucket']}",
+            'Format': 'Report_CSV_20180820',
+            'Enabled': True,
+            'Prefix': report_prefix,
+            'ReportScope': 'FailedTasksOnly'
+        },
+        Priority=10,
+        RoleArn=config['batch_role_arn'],
+        ClientRequestToken=str(uuid.uuid4()),
+        Description=description
+    )
+    job_id = response['JobId']
+    logger.info(f"Created Batch Operations job {job_id}: {description}")
+
+    while True:
+        job = s3control_client.describe_job(AccountId=config['account_id'], JobId=job_id)['Job']
+        if job['Status'] in ('Complete', 'Failed', 'Cancelled'):
+            break
+        progress = job.get('ProgressSummary', {})
+        logger.info(f"Batch job {job_id} is {job['Status']}: "
+                    f"{progress.get('NumberOfTasksSucceeded', 0)} succeeded, "
+                    f"{progress.get('NumberOfTasksFailed', 0)} failed "
+                    f"of {progress.get('TotalNumberOfTasks', 0)}")
+        time.sleep(BATCH_JOB_POLL_INTERVAL)
+
+    logger.info(f"Batch job {job_id} finished with status {job['Status']}")
+    return job
+
+def read_failed_batch_keys(config, report_prefix, job_id):
+    """Return the keys of failed tasks from a Batch Operations completion report"""
+    s3_client = get_s3_client()
+    report_bucket = config['batch_manifest_bucket']
+    report_manifest = json.loads(s3_client.get_object(
+        Bucket=report_bucket,
+        Key=f"{report_prefix}/job-{job_id}/manifest.json"
+    )['Body'].read())
+
+    failed_keys = set()
+    for result in report_manifest.get('Results', []):
+        if result.get('TaskExecutionStatus') != 'failed':
+            continue
+        body = s3_client.get_object(Bucket=report_bucket, Key=result['Key'])['Body'].read()
+        for row in csv.reader(io.StringIO(body.decode('utf-8'))):
+            failed_keys.add(unquote_plus(row[1]))
+    return failed_keys
+
+def convert_with_batch_operations(logger, config, bucket_name, objects, stats, run_prefix):
+    """Convert objects to Intelligent-Tiering with an S3 Batch Operations copy job"""
+    objects_to_convert = []
+    for obj in objects:
+        if not obj['convert_to_intelligent']:
+            stats.skipped += 1
+            logger.info(f"Skipping conversion for: {obj['key']}")
+            continue
+        objects_to_convert.append(obj)
+    if not objects_to_convert:
+        return
+
+    manifest_location = write_batch_manifest(bucket_name, config['batch_manifest_bucket'],
+                                             f"{run_prefix}/convert.csv", objects_to_convert)
+    job = run_batch_job(
+        logger, config,
+        {'S3PutObjectCopy': {
+            'TargetResource': f"arn:aws:s3:::{bucket_name}",
+            'StorageClass': 'INTELLIGENT_TIERING',
+            'MetadataDirective': 'COPY'
+        }},
+        manifest_location, f"{run_prefix}/reports", "Convert to Intelligent-Tiering"
+    )
+    progress = job.get('ProgressSummary', {})
+    stats.converted += progress.get('NumberOfTasksSucceeded', 0)
+    stats.failed += len(objects_to_convert) - progress.get('NumberOfTasksSucceeded', 0)
+
+def restore_with_batch_operations(logger, config, bucket_name, objects, run_prefix):
+    """Initiate Glacier restores with an S3 Batch Operations job
 
+    Returns the objects whose restore was initiated; they still have to be
+    waited on before conversion.
+    """
+    manifest_location = write_batch_manifest(bucket_name, config['batch_manifest_bucket'],
+                                             f"{run_prefix}/restore.csv", objects)
+    report_prefix = f"{run_prefix}/reports"
+    job = run_batch_job(
+        logger, config,
+        {'S3InitiateRestoreObject': {'ExpirationInDays': 10, 'GlacierJobTier': 'BULK'}},
+        manifest_location, report_prefix, "Restore Glacier objects"
+    )
+    if job['Status'] != 'Complete':
+        logger.error(f"Restore job {job['JobId']} did not complete: {job['Status']}")
+        return []
+
+    failed_keys = read_failed_batch_keys(config, report_prefix, job['JobId'])
+    for key in failed_keys:
+        logger.error(f"Error initiating restore for {key}")
+    return [obj for obj in objects if obj['key'] not in failed_keys]
+
+@functools.lru_cache(maxsize=None)
 def create_storage_configs(config_string):
     storage_configs = []
     parts = config_string.split("#")
@@ -201,7 +1042,7 @@ def create_storage_configs(config_string):
         except KeyError:
             print(f"Skipping invalid storage class: {part}")
     
-    return storage_configs
+    return tuple(storage_configs)
 
 def main():
     # Setup logging
@@ -212,8 +1053,10 @@ def main():
     config = load_config()
     bucket_name = config['bucket_name']
     prefix = config['prefix_path']
-    check_interval = 3600
+    check_interval = MAX_CHECK_INTERVAL
     storageclass = config['storageclass']
+    restore_queue_url = config['restore_queue_url']
+    inventory_manifest_uri = config['inventory_manifest_uri'] if config['use_inventory'] else ''
 
     # Configure storage classes
     storage_configs = create_storage_configs(storageclass)
@@ -224,35 +1067,131 @@ def main():
     try:
         logger.info("Starting object processing...")
         logger.info("Starting object processing111...") 
-        objects_by_storage_class, stats = process_glacier_objects(logger, bucket_name, storage_configs, prefix)
-        
-        # Process Glacier IR objects (direct conversion)
-        glacier_ir_objects = objects_by_storage_class.get(StorageClass.GLACIER_IR, [])
-        if glacier_ir_objects:
-            logger.info("\nProcessing Glacier IR objects...")
-            convert_to_intelligent_tiering(logger, bucket_name, glacier_ir_objects, 
-                                        stats[StorageClass.GLACIER_IR])
-        
-        # Process Glacier objects (requires restore)
-        glacier_objects = objects_by_storage_class.get(StorageClass.GLACIER, [])
-        if glacier_objects:
-            logger.info("\nProcessing Glacier objects...")
-            objects_to_restore = initiate_restore_for_glacier_objects(logger, bucket_name, glacier_objects)
-            
-            while objects_to_restore:
-                logger.info(f"\nChecking restore status for {len(objects_to_restore)} objects...")
-                restored_objects = check_restore_status(logger, bucket_name, objects_to_restore)
-                
-                objects_to_restore = [obj for obj in objects_to_restore if obj not in restored_objects]
-                
-                if objects_to_restore:
-                    logger.info(f"Waiting for {len(objects_to_restore)} objects to complete restore...")
-                    time.sleep(check_interval)
-                
-                if restored_objects:
-                    convert_to_intelligent_tiering(logger, bucket_name, restored_objects, 
-                                                stats[StorageClass.GLACIER])
-        
+        stats = {config.storage_class: ConversionStats() for config in storage_configs}
+        batches = {config.storage_class: [] for config in storage_configs}
+        objects_to_restore = []
+
+        # One long-lived pool per stage; objects are submitted individually
+        restore_stage = WorkerStage(RESTORE_WORKERS)
+        convert_stage = WorkerStage(MAX_WORKERS)
+
+        def restore_initiated(future):
+            obj = future.result()
+            if obj is not None:
+                objects_to_restore.append(obj)
+
+        def process_object(storage_class, obj):
+            if storage_class == StorageClass.GLACIER_IR:
+                # Glacier IR objects are converted directly
+                submit_conversion(logger, convert_stage, bucket_name, obj, stats[storage_class])
+            else:
+                # Glacier objects require restore first
+                restore_stage.submit(initiate_restore, initiate_restore_async,
+                                     logger, bucket_name, obj, on_done=restore_initiated)
+
+        def convert_restored(obj):
+            submit_conversion(logger, convert_stage, bucket_name, obj, stats[StorageClass.GLACIER])
+
+        def consume(storage_class, object_queue, handle_object):
+            while True:
+                obj = object_queue.get()
+                if obj is None:
+                    break
+                try:
+                    handle_object(storage_class, obj)
+                except Exception as e:
+                    logger.error(f"Error processing {obj['key']}: {str(e)}")
+
+        objects = process_glacier_objects(logger, bucket_name, storage_configs, stats,
+                                          prefix, inventory_manifest_uri)
+        if config['use_batch_operations']:
+            # Batch Operations jobs need the complete manifest up front
+            for storage_class, obj in objects:
+                batches[storage_class].append(obj)
+
+            run_prefix = f"s3transition-batch/{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            if batches.get(StorageClass.GLACIER_IR):
+                convert_with_batch_operations(logger, config, bucket_name,
+                                              batches[StorageClass.GLACIER_IR],
+                                              stats[StorageClass.GLACIER_IR], run_prefix)
+            if batches.get(StorageClass.GLACIER):
+                objects_to_restore = restore_with_batch_operations(logger, config, bucket_name,
+                                                                   batches[StorageClass.GLACIER],
+                                                                   run_prefix)
+        else:
+            # Listing produces objects into one queue per storage class while a
+            # consumer thread per class submits them to the restore or convert stage
+            object_queues = {storage_class: queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+                             for storage_class in batches}
+
+            consumers = [
+                threading.Thread(target=consume, args=(storage_class, object_queue, process_object))
+                for storage_class, object_queue in object_queues.items()
+            ]
+            for consumer in consumers:
+                consumer.start()
+
+            try:
+                for storage_class, obj in objects:
+                    object_queues[storage_class].put(obj)
+            finally:
+                # None marks the end of the stream for each consumer
+                for object_queue in object_queues.values():
+                    object_queue.put(None)
+                for consumer in consumers:
+                    consumer.join()
+                restore_stage.shutdown()
+            logger.info(f"Initiated restore for {len(objects_to_restore)} Glacier objects")
+
+        if objects_to_restore:
+            # Restored objects are submitted to the convert stage as soon as each
+            # one completes rather than once per polling cycle
+            pending = {obj['key']: obj for obj in objects_to_restore}
+            if restore_queue_url:
+                # Event-driven: convert objects as their restore events arrive and
+                # fall back to a HEAD sweep when no events have been seen for a while
+                last_sweep = time.time()
+                logger.info(f"Waiting for restore events for {len(pending)} objects...")
+                while pending:
+                    restored_objects = receive_restore_events(logger, restore_queue_url,
+                                                              bucket_name, pending)
+                    for obj in restored_objects:
+                        convert_restored(obj)
+
+                    if not restored_objects and time.time() - last_sweep >= check_interval:
+                        logger.info(f"\nReconciling restore status for {len(pending)} objects...")
+                        restored_objects = check_restore_status(logger, bucket_name,
+                                                                list(pending.values()),
+                                                                on_restored=convert_restored)
+                        last_sweep = time.time()
+
+                    for obj in restored_objects:
+                        pending.pop(obj['key'], None)
+            else:
+                # Poll more often while restores are completing and back off
+                # while none are
+                interval = MIN_CHECK_INTERVAL
+                while pending:
+                    logger.info(f"\nChecking restore status for {len(pending)} objects...")
+                    restored_objects = check_restore_status(logger, bucket_name,
+                                                            list(pending.values()),
+                                                            on_restored=convert_restored)
+
+                    for obj in restored_objects:
+                        pending.pop(obj['key'], None)
+
+                    if restored_objects:
+                        interval = max(MIN_CHECK_INTERVAL, interval // 2)
+                    else:
+                        interval = min(MAX_CHECK_INTERVAL, int(interval * 1.5))
+
+                    if pending:
+                        logger.info(f"Waiting {interval}s for {len(pending)} objects to complete restore...")
+                        time.sleep(interval)
+
+        # Let in-flight conversions finish before reporting
+        convert_stage.shutdown()
+
         # Log final statistics
         logger.info("\nConversion Statistics:")
         for storage_class, stat in stats.items():